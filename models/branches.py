@@ -1,28 +1,22 @@
+from dataclasses import dataclass, field
 from typing import Optional
-from pydantic import BaseModel
 from models.repos import RepositoryItem
 from gitlab.v4.objects import ProjectBranch
 
-class Branch(BaseModel):
+@dataclass(slots=True)
+class Branch:
     """
     Class to represent a branch in a GitLab repository.
     """
     name: str
     branch: Optional[ProjectBranch] = None
-    contents: list[RepositoryItem] = []
-    
-    model_config = {
-        "arbitrary_types_allowed": True
-    }
+    contents: list[RepositoryItem] = field(default_factory=list)
 
-class BranchManager(BaseModel):
+@dataclass(slots=True)
+class BranchManager:
     """
     Class to manage branches in a GitLab repository.
     """
-    main: Optional[Branch]
+    main: Optional[Branch] = None
     has_more: bool = False
-    other_branches: list[Branch] = []
-    
-    model_config = {
-        "arbitrary_types_allowed": True
-    }
\ No newline at end of file
+    other_branches: list[Branch] = field(default_factory=list)
@@ -1,9 +1,48 @@
-from pydantic import BaseModel
-from typing import Optional, Literal
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional, Literal
 from gitlab import Gitlab
 from gitlab.v4.objects import Project
 
-class RepositoryItem(BaseModel):
+class TreeTable(NamedTuple):
+    """
+    Column-wise view of a repository tree for bulk walks.
+
+    Parallel lists keep the hot loops over thousands of entries on
+    contiguous storage instead of one heap object per entry.
+    """
+    paths: list[str]
+    types: list[str]
+    shas: list[str]
+    modes: list[str]
+
+    @classmethod
+    def empty(cls) -> "TreeTable":
+        """
+        Create an empty table to be filled column by column.
+        Returns:
+            TreeTable: A table with four fresh columns.
+        """
+        return cls([], [], [], [])
+
+    @classmethod
+    def from_entries(cls, entries: list[dict]) -> "TreeTable":
+        """
+        Build a table from a flat recursive tree listing.
+        Args:
+            entries (list[dict]): Raw entries from the repository tree endpoint.
+        Returns:
+            TreeTable: The entries split into columns.
+        """
+        table = cls.empty()
+        for entry in entries:
+            table.paths.append(entry.get("path"))
+            table.types.append(entry.get("type"))
+            table.shas.append(entry.get("id"))
+            table.modes.append(entry.get("mode"))
+        return table
+
+@dataclass(slots=True)
+class RepositoryItem:
     """
     Represents an item in a GitLab repository.
     """
@@ -12,25 +51,39 @@ class RepositoryItem(BaseModel):
     path: Optional[str] = None
     mode: Optional[str] = None
     type: Literal["blob", "tree"] = "blob"
-    
-        
-    self: Gitlab
-    repo_name: str
+
+    repo_name: str = ""
     branch: str = "main"
-    
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "extra": "allow"
-    }
-    
-    def tree(self) -> list["RepositoryItem"]:
+
+    self: Optional[Gitlab] = field(default=None, init=False, repr=False, compare=False)
+    # Defaults to the list builtin so tree() yields [] on blobs without a
+    # callback object allocated per item; directories get a real callback.
+    tree: Callable[[], list["RepositoryItem"]] = field(default=list, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_api(cls, entry: dict, *, client: Gitlab, repo_name: str, branch: str = "main") -> "RepositoryItem":
         """
-        Iterate over the items in the repository tree.
+        Build an item from a raw tree entry.
+        Args:
+            entry (dict): A single entry from the repository tree endpoint.
+            client (Gitlab): The GitLab client the item belongs to.
+            repo_name (str): Full name of the repository (e.g., "owner/repo").
+            branch (str): Branch the entry belongs to.
         Returns:
-            list[RepositoryItem]: List of items in the repository tree, if item is a directory.
+            RepositoryItem: The constructed item.
         """
-        pass
-    
+        item = cls(
+            id=entry.get("id"),
+            name=entry.get("name"),
+            path=entry.get("path"),
+            mode=entry.get("mode"),
+            type=entry.get("type", "blob"),
+            repo_name=repo_name,
+            branch=branch,
+        )
+        item.self = client
+        return item
+
     @property
     def is_dir(self) -> bool:
         """
@@ -39,7 +92,7 @@ class RepositoryItem(BaseModel):
             bool: True if the item is a directory, False otherwise.
         """
         return self.type == "tree"
-    
+
     @property
     def is_file(self) -> bool:
         """
@@ -55,16 +108,16 @@ class CloneableProject(Project):
     """
     full_name: str
     clone: Optional[callable] = None
-    
+
     model_config = {
         "arbitrary_types_allowed": True,
         "extra": "allow"
     }
-    
+
     def clone(self, overwrite: bool = False, **kwargs) -> str:
         """
         Clone the repository using the provided parameters.
-        
+
         :param overwrite: If True, overwrite existing files.
         :param kwargs: Additional parameters for cloning.
         :return: The clone command or URL.
@@ -72,4 +125,4 @@ class CloneableProject(Project):
         pass
 
 
-CloneableProject.clone
\ No newline at end of file
+CloneableProject.clone
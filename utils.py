@@ -1,14 +1,26 @@
+import asyncio
 import base64
+import json
 import os
+import tarfile
 
-from functools import partial
+import aiohttp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
+from urllib.parse import quote_plus
 
 from gitlab import Gitlab
 from gitlab.v4.objects import Project
 
 from models.branches import Branch, BranchManager
-from models.repos import RepositoryItem, CloneableProject
+from models.repos import RepositoryItem, CloneableProject, TreeTable
 from settings import settings
 
 
@@ -34,43 +46,167 @@ class GitLab(Gitlab):
             url=url or self.settings.gitlab_base_url,
             private_token=token or self.settings.gitlab_access_token,
         )
+        # Bound per instance: projects are immutable for the session, so one
+        # HTTP GET per full name is enough.
+        if orjson is not None:
+            self.session.hooks.setdefault("response", []).append(self._use_orjson)
+        self._get_project = lru_cache(maxsize=128)(self.projects.get)
+        self._repository_tree = lru_cache(maxsize=64)(self._fetch_repository_tree)
         self.auth()
 
+    def auth(self) -> None:
+        super().auth()
+        self._get_project.cache_clear()
+        self._repository_tree.cache_clear()
+
+    @staticmethod
+    def _use_orjson(response, *args, **kwargs):
+        """
+        Response hook that swaps requests' json() for orjson.
+
+        orjson parses the multi-thousand-entry tree and branch payloads
+        several times faster than the stdlib decoder.
+        """
+        response.json = lambda **kwargs: orjson.loads(response.content)
+        return response
+
     def can_iterate(self, item: RepositoryItem) -> RepositoryItem:
         """
         Check if the item can be iterated over (i.e., if it is a directory).
 
+        Kept for backwards compatibility: children are attached eagerly by
+        `_build_tree` from a single recursive listing, so there is nothing
+        left to do here.
+
         Args:
             item (RepositoryItem): The item to check.
 
         Returns:
-            RepositoryItem: The item itself if it can be iterated, otherwise None.
+            RepositoryItem: The item itself, with its tree already populated.
+        """
+        return item
+
+    async def _fetch_tree(self, session: aiohttp.ClientSession, project_id: int, ref: str, semaphore: asyncio.Semaphore) -> tuple[str, list[dict]]:
+        """
+        Fetch the full recursive tree of a single ref over aiohttp.
+
+        Args:
+            session (aiohttp.ClientSession): Session carrying the auth header.
+            project_id (int): Numeric id of the GitLab project.
+            ref (str): Branch or tag to list.
+            semaphore (asyncio.Semaphore): Concurrency cap shared between refs.
+
+        Returns:
+            tuple[str, list[dict]]: The ref and its flat tree entries.
+        """
+        entries = []
+        page = 1
+        async with semaphore:
+            while True:
+                async with session.get(
+                    f"{self.url}/api/v4/projects/{project_id}/repository/tree",
+                    params={"ref": ref, "recursive": "true", "per_page": 100, "page": page},
+                ) as response:
+                    response.raise_for_status()
+                    entries.extend(await response.json(loads=orjson.loads if orjson else json.loads))
+                    next_page = response.headers.get("x-next-page")
+                if not next_page:
+                    break
+                page = int(next_page)
+        return ref, entries
+
+    def _fetch_branch_trees(self, project_id: int, refs: list[str], max_concurrency: int = 5) -> dict[str, list[dict]]:
+        """
+        Fetch the recursive trees of several refs concurrently.
+
+        Args:
+            project_id (int): Numeric id of the GitLab project.
+            refs (list[str]): Branches or tags to list.
+            max_concurrency (int, optional): Maximum requests in flight. Defaults to 5.
+
+        Returns:
+            dict[str, list[dict]]: Flat tree entries keyed by ref.
+        """
+        async def fetch_all():
+            semaphore = asyncio.Semaphore(max_concurrency)
+            headers = {"PRIVATE-TOKEN": self.private_token} if self.private_token else {}
+            async with aiohttp.ClientSession(headers=headers) as session:
+                return await asyncio.gather(*[
+                    self._fetch_tree(session, project_id, ref, semaphore) for ref in refs
+                ])
+
+        return dict(asyncio.run(fetch_all()))
+
+    def _fetch_repository_tree(self, full_name: str, ref: str) -> list[dict]:
+        """
+        Fetch the flat recursive tree of a ref, revalidating a disk cache.
+
+        The listing and the first page's ETag are stored under
+        ~/.cache/gitlabapi/<project>/<ref>.json; later runs send
+        If-None-Match and are served from disk when the server answers 304.
+
+        Args:
+            full_name (str): Full name of the repository (e.g., "owner/repo").
+            ref (str): Branch or tag to list.
+
+        Returns:
+            list[dict]: Flat tree entries for the ref.
         """
-        def tree(item: RepositoryItem) -> list[RepositoryItem]:
-            """
-            Iterate over the items in the repository tree.
+        cache_file = Path.home() / ".cache" / "gitlabapi" / full_name / f"{ref}.json"
+        cached = None
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                cached = None
+
+        url = f"{self.url}/api/v4/projects/{quote_plus(full_name)}/repository/tree"
+        params = {"ref": ref, "recursive": "true", "per_page": 100, "page": 1}
+        headers = {"PRIVATE-TOKEN": self.private_token} if self.private_token else {}
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return cached["entries"]
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        entries = response.json()
+        headers.pop("If-None-Match", None)
+        while response.headers.get("x-next-page"):
+            params["page"] = int(response.headers["x-next-page"])
+            response = self.session.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            entries.extend(response.json())
+
+        if etag:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps({"etag": etag, "entries": entries}), encoding='utf-8')
+        return entries
+
+    def _build_tree(self, entries: list[dict], repo_name: str, branch: str) -> list[RepositoryItem]:
+        """
+        Build a RepositoryItem forest from a flat recursive tree listing.
+
+        Args:
+            entries (list[dict]): Flat tree entries from a recursive repository_tree call.
+            repo_name (str): Full name of the repository (e.g., "owner/repo").
+            branch (str): Branch the entries belong to.
 
-            Returns:
-                list[RepositoryItem]: List of items in the repository tree, if item is a directory.
-            """
+        Returns:
+            list[RepositoryItem]: Top-level items, with children attached to every directory.
+        """
+        items = []
+        children: dict[str, list[RepositoryItem]] = {"": []}
+        for entry in entries:
+            item = RepositoryItem.from_api(entry, client=self, repo_name=repo_name, branch=branch)
+            items.append(item)
+            children.setdefault(item.path.rpartition('/')[0], []).append(item)
+        for item in items:
             if item.type == "tree":
-                return [
-                    self.can_iterate(
-                        RepositoryItem(
-                            **subitem,
-                            self=item.self,
-                            repo_name=item.repo_name,
-                            branch=item.branch
-                        )
-                    )
-                    for subitem in item.self.projects.get(item.repo_name).repository_tree(
-                        ref=item.branch, path=item.path
-                    )
-                ]
-            return []
-
-        item.tree = partial(tree, item=item)
-        return item
+                item.tree = partial(list, children.get(item.path, []))
+        return children[""]
 
     def decode_content(self, content):
         """
@@ -82,10 +218,15 @@ class GitLab(Gitlab):
         Returns:
             tuple: Decoded content and a flag indicating if it is a string (1) or bytes (0).
         """
+        raw = base64.b64decode(content)
+        # bytes.isascii is a single C-level scan; most source files take this
+        # path and skip the UTF-8 state machine entirely.
+        if raw.isascii():
+            return raw.decode('ascii'), 1
         try:
-            return base64.b64decode(content).decode('utf-8'), 1
-        except Exception:
-            return base64.b64decode(content), 0
+            return raw.decode('utf-8'), 1
+        except UnicodeDecodeError:
+            return raw, 0
 
     def get_repository_contents(self, full_name: str = None, project: Project = None, ref: str = "main") -> BranchManager:
         """
@@ -99,84 +240,76 @@ class GitLab(Gitlab):
             BranchManager: Organized repository contents.
         """
         if not project:
-            project = self.projects.get(full_name)
+            project = self._get_project(full_name)
 
-        branches = project.branches.list()
+        # per_page=100 is the server-side maximum; anything less multiplies
+        # the pagination round-trips.
+        branches = project.branches.list(per_page=100, all=True)
+        by_id = {branch.encoded_id: branch for branch in branches}
         contents = {}
 
         if ref:
             ref = str(ref).strip()
-            ref_branch = next((b for b in branches if b.encoded_id == ref), None)
+            ref_branch = by_id.get(ref)
             if not ref_branch:
                 return BranchManager(main=Branch(name=ref))
 
-            branch_contents = [
-                self.can_iterate(
-                    RepositoryItem(
-                        **item,
-                        self=self,
-                        repo_name=full_name or project.path_with_namespace,
-                        branch=ref
-                    )
-                )
-                for item in project.repository_tree(ref=ref)
-            ]
+            branch_contents = self._build_tree(
+                self._repository_tree(full_name or project.path_with_namespace, ref),
+                repo_name=full_name or project.path_with_namespace,
+                branch=ref
+            )
             return BranchManager(
                 main=Branch(name=ref, branch=ref_branch, contents=branch_contents),
                 has_more=False,
                 other_branches=[]
             )
 
+        trees = self._fetch_branch_trees(project.id, [branch.encoded_id for branch in branches])
         for branch in branches:
-            branch_contents = [
-                self.can_iterate(
-                    RepositoryItem(
-                        **item,
-                        self=self,
-                        repo_name=full_name or project.path_with_namespace,
-                        branch=branch.encoded_id
-                    )
-                )
-                for item in project.repository_tree(ref=branch.encoded_id)
-            ]
-            contents[branch.encoded_id] = branch_contents
+            contents[branch.encoded_id] = self._build_tree(
+                trees[branch.encoded_id],
+                repo_name=full_name or project.path_with_namespace,
+                branch=branch.encoded_id
+            )
 
         main_branch_contents = contents.pop("main", None)
 
         return BranchManager(
             main=Branch(
                 name="main",
-                branch=next((b for b in branches if b.encoded_id == "main"), None),
+                branch=by_id.get("main"),
                 contents=main_branch_contents or []
             ),
             has_more=len(contents) > 0,
             other_branches=[
                 Branch(
-                    name=branch.encoded_id,
+                    name=branch_id,
                     branch=branch,
-                    contents=contents.get(branch.encoded_id, [])
+                    contents=contents.get(branch_id, [])
                 )
-                for branch in branches if branch.encoded_id != "main"
+                for branch_id, branch in by_id.items() if branch_id != "main"
             ]
         )
 
-    def clone_repo(self, full_name: str, ref: str = "main", overwrite: bool = False) -> str:
+    def clone_repo(self, full_name: str, ref: str = "main", overwrite: bool = False, use_archive: bool = True) -> str:
         """
         Clone the repository using the provided parameters.
 
         Args:
             full_name (str): Full name of the repository (e.g., "owner/repo").
             ref (str, optional): Reference branch or tag to clone. Defaults to None.
+            use_archive (bool, optional): Download the repository as a single
+                archive instead of fetching files one by one. Defaults to True.
 
         Returns:
             str: The clone command or URL.
         """
-        project = self.projects.get(full_name)
-        manager = self.get_repository_contents(project=project, ref=ref)
+        project = self._get_project(full_name)
         _, repo_name = full_name.split('/')
-        repo_path = Path(os.path.join(os.getcwd(), repo_name))
+        repo_path = Path.cwd() / repo_name
 
-        if os.path.exists(str(repo_path)):
+        if repo_path.exists():
             if not overwrite:
                 self.info(f"Directory {repo_name} already exists. Use overwrite=True to replace it.")
                 return
@@ -184,33 +317,51 @@ class GitLab(Gitlab):
 
         repo_path.mkdir(parents=True, exist_ok=True)
 
-        def process_content(branch_manager: BranchManager):
-            for item in branch_manager.main.contents:
-                if item.type == "blob":
-                    item_path = repo_path / Path(item.path)
-                    item_path.parent.mkdir(parents=True, exist_ok=True)
-                    content, flag = self.decode_content(
-                        item.self.projects.get(full_name).files.get(item.path, ref=ref).content
-                    )
-                    with open(
-                        repo_path / item.path,
-                        'w' if flag else 'wb',
-                        **dict(encoding='utf-8') if flag else {}
-                    ) as f:
-                        f.write(content)
-                elif item.type == "tree":
-                    dir_path = Path(os.path.join(repo_name, item.path))
-                    dir_path.mkdir(parents=True, exist_ok=True)
-                    sub_contents = item.tree()
-                    for sub_item in sub_contents:
-                        sub_item.self = self
-                        sub_item.repo_name = full_name
-                        sub_item.branch = ref or "main"
-                        process_content(
-                            BranchManager(main=Branch(name=item.name, contents=[sub_item]))
-                        )
-
-        process_content(manager)
+        if use_archive:
+            response = self.http_get(
+                f"/projects/{project.encoded_id}/repository/archive.tar.gz",
+                query_data={"sha": ref},
+                streamed=True,
+                raw=True,
+            )
+            response.raw.decode_content = True
+            with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+                for member in archive:
+                    # The archive wraps everything in a "<repo>-<ref>-<sha>/" directory.
+                    member.name = member.name.partition('/')[2]
+                    if member.name:
+                        archive.extract(member, repo_path, filter='data')
+            return
+
+        # The recursive listing already contains every directory and each
+        # blob's SHA, so everything loop-invariant is computed once up front:
+        # the flat table, the target paths and the set of directories.
+        table = TreeTable.from_entries(self._repository_tree(full_name, ref))
+        targets = [repo_path / path for path in table.paths]
+
+        dirs = {
+            targets[i] if table.types[i] == "tree" else targets[i].parent
+            for i in range(len(table.paths))
+        }
+        # The recursive listing contains every intermediate directory, so
+        # creating them shallowest-first needs no parents=True walk — one
+        # mkdir syscall per directory instead of one per path component.
+        for directory in sorted(dirs, key=lambda path: len(path.parts)):
+            directory.mkdir(exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=8) as fetchers, \
+                ThreadPoolExecutor(max_workers=os.cpu_count()) as writers:
+            futures = {
+                fetchers.submit(project.repository_raw_blob, table.shas[i]): targets[i]
+                for i in range(len(table.paths))
+                if table.types[i] == "blob"
+            }
+            writes = [
+                writers.submit(futures[future].write_bytes, future.result())
+                for future in as_completed(futures)
+            ]
+            for write in writes:
+                write.result()
 
     def get_file_content(self, full_name: str, path: str, ref: str = "main") -> tuple[str, int]:
         """
@@ -224,7 +375,7 @@ class GitLab(Gitlab):
         Returns:
             tuple: Decoded content and a flag indicating if it is a string (1) or bytes (0).
         """
-        project = self.projects.get(full_name)
+        project = self._get_project(full_name)
         file = project.files.get(file_path=path, ref=ref)
         return file.decode(), 0
 
@@ -238,4 +389,4 @@ class GitLab(Gitlab):
         Returns:
             list[Project]: List of repositories that can be cloned.
         """
-        return [can_clone(self, project) for project in self.projects.list(username=username)]
\ No newline at end of file
+        return [can_clone(self, project) for project in self.projects.list(username=username, per_page=100, iterator=True)]
\ No newline at end of file